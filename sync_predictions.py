@@ -6,41 +6,502 @@ Exports predictions from the pipeline database to the public JSON file
 for the prediction tracker website.
 
 Usage:
-    python sync_predictions.py                  # Sync all predictions
-    python sync_predictions.py --add            # Interactive add new prediction
-    python sync_predictions.py --evaluate ID    # Mark prediction outcome
+    python sync_predictions.py                       # Sync all predictions
+    python sync_predictions.py --add                 # Interactive add new prediction
+    python sync_predictions.py --add < pred.txt      # ...answers read from a file
+    python sync_predictions.py --evaluate ID         # Mark prediction outcome
+    python sync_predictions.py --evaluate-batch FILE # Apply a JSONL file of outcomes
+    python sync_predictions.py --compact             # Fold the change log into the JSON
+    python sync_predictions.py --compact --pretty    # ...written indented for humans
+    python sync_predictions.py --backend sqlite      # Use predictions.db as the store
+
+Adds and evaluations are appended to a JSON-Lines change log next to
+predictions.json instead of rewriting the whole file each time. The log is
+folded back into predictions.json by --compact or by the default sync run.
+
+With --backend sqlite the predictions live in predictions.db instead, which
+is seeded from predictions.json on first use and takes in any JSON change log
+each time it is opened; --compact and the default sync run export it back to
+predictions.json for the website. Changes made through the SQLite backend
+reach predictions.json only when it is exported.
 """
 
-import json
-import argparse
-from datetime import datetime, timedelta
+import io
+import os
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta
+from operator import attrgetter
 from pathlib import Path
-import uuid
+
+# orjson, imported on first use since it pulls in json, uuid and zoneinfo;
+# False until tried, None if it is not installed
+_orjson = False
+
+
+def _get_orjson():
+    """Return the orjson module, or None if it is not installed."""
+    global _orjson
+    if _orjson is False:
+        try:
+            import orjson
+        except ImportError:
+            orjson = None
+        _orjson = orjson
+    return _orjson
+
+
+def _json_loads(data):
+    """Parse JSON bytes, using orjson when it is installed."""
+    orjson = _get_orjson()
+    if orjson is not None:
+        return orjson.loads(data)
+    # The stdlib module is only needed as a fallback
+    import json
+    return json.loads(data)
+
+
+def _json_dumps(obj, pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed."""
+    orjson = _get_orjson()
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    import json
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _tally_items(predictions) -> tuple:
+    """Count outcomes and sum Brier terms in one pass over any iterable.
+
+    Returns the same tuple as PredictionSync._tally, which uses this for the
+    in-memory and streamed JSON backends.
+    """
+    total = evaluated = correct = incorrect = pending = 0
+    brier_sum = 0.0
+    for p in predictions:
+        total += 1
+        outcome = p.outcome
+        if outcome == 'pending':
+            pending += 1
+            continue
+        evaluated += 1
+        conf = p.confidence / 100
+        if outcome == 'correct':
+            correct += 1
+            brier_sum += (conf - 1) ** 2
+        else:
+            if outcome == 'incorrect':
+                incorrect += 1
+            brier_sum += conf ** 2
+    return total, evaluated, correct, incorrect, pending, brier_sum
+
+
+# predictions.json files at least this large are streamed with ijson when
+# only one record or the statistics are needed (see PredictionSync.stream)
+_STREAM_MIN_BYTES = 4 * 1024 * 1024
+
+# Standard prediction fields, in JSON key order; the SQLite backend stores
+# each as a column and keeps `extra` as a JSON object
+_FIELDS = ('id', 'prediction', 'domain', 'confidence', 'created_date',
+           'due_date', 'verification', 'falsification', 'sources',
+           'outcome', 'evaluated_date', 'outcome_notes')
+_FIELD_SET = frozenset(_FIELDS)
+
+
+class Prediction:
+    """A single tracked prediction.
+
+    Keys in predictions.json beyond the standard fields (reasoning,
+    key_indicators, ...) are kept in `extra` and written back unchanged.
+    Written out by hand rather than as a dataclass: importing dataclasses
+    pulls in inspect, which costs more than the rest of the startup.
+    """
+    __slots__ = _FIELDS + ('extra',)
+
+    def __init__(self, id: str, prediction: str, domain: str, confidence: int,
+                 created_date: str, due_date: str, verification: str = "",
+                 falsification: str = "", sources: list | None = None,
+                 outcome: str = "pending", evaluated_date: str | None = None,
+                 outcome_notes: str | None = None, extra: dict | None = None):
+        self.id = id
+        self.prediction = prediction
+        self.domain = domain
+        self.confidence = confidence
+        self.created_date = created_date
+        self.due_date = due_date
+        self.verification = verification
+        self.falsification = falsification
+        self.sources = [] if sources is None else sources
+        self.outcome = outcome
+        self.evaluated_date = evaluated_date
+        self.outcome_notes = outcome_notes
+        self.extra = {} if extra is None else extra
+
+    def __repr__(self) -> str:
+        return f"Prediction(id={self.id!r}, outcome={self.outcome!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Prediction):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Prediction":
+        """Build a Prediction from its JSON form."""
+        known = {k: v for k, v in data.items() if k in _FIELD_SET}
+        extra = {k: v for k, v in data.items() if k not in _FIELD_SET}
+        return cls(**known, extra=extra)
+
+    def to_dict(self) -> dict:
+        """Return the JSON form, with any extra keys after the standard ones."""
+        data = {name: getattr(self, name) for name in _FIELDS}
+        data.update(self.extra)
+        return data
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id TEXT PRIMARY KEY,
+    prediction TEXT NOT NULL,
+    domain TEXT,
+    confidence INTEGER,
+    created_date TEXT,
+    due_date TEXT,
+    verification TEXT,
+    falsification TEXT,
+    sources TEXT,
+    outcome TEXT NOT NULL DEFAULT 'pending',
+    evaluated_date TEXT,
+    outcome_notes TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outcome_due ON predictions(outcome, due_date);
+"""
+
+_INSERT_SQL = f"INSERT OR IGNORE INTO predictions VALUES ({', '.join('?' * (len(_FIELDS) + 1))})"
+
+
+def _prediction_to_row(pred: Prediction) -> tuple:
+    """Flatten a prediction into a row of the predictions table."""
+    row = [getattr(pred, col) for col in _FIELDS]
+    row[_FIELDS.index('sources')] = _json_dumps(pred.sources).decode('utf-8')
+    row.append(_json_dumps(pred.extra).decode('utf-8') if pred.extra else None)
+    return tuple(row)
+
+
+def _row_to_prediction(row: tuple) -> Prediction:
+    """Rebuild a prediction from a row of the predictions table."""
+    values = list(row[:-1])
+    sources = _FIELDS.index('sources')
+    values[sources] = _json_loads(values[sources]) if values[sources] else []
+    return Prediction(*values, extra=_json_loads(row[-1]) if row[-1] else {})
 
 
 class PredictionSync:
-    def __init__(self):
+    def __init__(self, backend: str = 'json', durable: bool = False, stream: bool = False):
+        if backend not in ('json', 'sqlite'):
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend = backend
+        # fsync JSON writes; off by default since the rename is already atomic
+        self.durable = durable
+        # Defer loading the JSON backend so one-off lookups and statistics
+        # can stream a large predictions.json instead of parsing all of it
+        self.stream = stream
+        self._streamed = {}
+        # Whether the JSON backend holds changes predictions.json lacks
+        self._dirty = False
         self.public_dir = Path("/home/irfan/canadian_intel_hub/public")
         self.json_path = self.public_dir / "predictions.json"
+        self.log_path = self.public_dir / "predictions.log.jsonl"
+        self.db_path = self.public_dir / "predictions.db"
+        self._db = None
+        self.predictions = None
+        if backend == 'sqlite':
+            # Rows stay in the database; nothing is held in memory
+            self._open_db()
+        elif not stream:
+            self._load_json()
+
+    def _ensure_loaded(self):
+        """Load the JSON backend fully if it was deferred."""
+        if self.predictions is None and self._db is None:
+            self._load_json()
+
+    def _load_json(self):
+        """Load predictions.json and replay the change log on top of it."""
         self.predictions = self._load_predictions()
+        self._index_predictions()
+        self._replay_log()
 
     def _load_predictions(self) -> list:
         """Load existing predictions from JSON."""
-        if self.json_path.exists():
-            with open(self.json_path, 'r') as f:
-                return json.load(f)
-        return []
-
-    def _save_predictions(self):
-        """Save predictions to JSON."""
-        with open(self.json_path, 'w') as f:
-            json.dump(self.predictions, f, indent=4)
-        print(f"Saved {len(self.predictions)} predictions to {self.json_path}")
+        if not self.json_path.exists():
+            return []
+        return [Prediction.from_dict(d) for d in self._read_json()]
+
+    def _read_json(self) -> list:
+        """Parse predictions.json into plain dicts."""
+        with open(self.json_path, 'rb') as f:
+            # orjson can parse straight from a mapped buffer, skipping the
+            # read() copy; mmap refuses empty files, so those still read()
+            orjson = _get_orjson()
+            if orjson is not None:
+                import mmap
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError):
+                    mm = None
+                if mm is not None:
+                    with mm, memoryview(mm) as view:
+                        return orjson.loads(view)
+            return _json_loads(f.read())
+
+    def _index_predictions(self):
+        """Build lookup tables over the loaded predictions."""
+        self._by_id = {p.id: p for p in self.predictions}
+        # Pending predictions keyed by id, so list_pending doesn't rescan the
+        # list and an evaluation drops its entry in O(1)
+        self._pending = {p.id: p for p in self.predictions if p.outcome == 'pending'}
+        # IDs look like PRED-<year>-<seq>; count how many each year has used
+        self._year_counts = Counter(p.id.split('-')[1] for p in self.predictions)
+
+    def _read_log(self):
+        """Yield the changes logged since predictions.json was last compacted."""
+        if not self.log_path.exists():
+            return
+        with open(self.log_path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield _json_loads(line)
+                except ValueError:
+                    # A crash mid-append can leave a torn final line
+                    print(f"Skipping unreadable entry in {self.log_path}")
+
+    def _replay_log(self):
+        """Apply logged changes to the freshly loaded predictions."""
+        for event in self._read_log():
+            self._apply(event)
+            self._dirty = True
+
+    def _can_stream(self) -> bool:
+        """Whether to stream predictions.json rather than load it whole."""
+        if not (self.stream and self.predictions is None and self._db is None
+                and self.json_path.exists()
+                and self.json_path.stat().st_size >= _STREAM_MIN_BYTES):
+            return False
+        # Only checked once the file is known to be large enough to stream
+        from importlib.util import find_spec
+        return find_spec('ijson') is not None
+
+    def _load_predictions_streaming(self, filter_fn=None):
+        """Yield predictions one at a time from predictions.json using ijson.
+
+        Logged changes are applied as records go past, so the results match
+        a full load; records rejected by filter_fn are dropped straight away.
+        Callers that stop iterating early skip parsing the rest of the file.
+        """
+        import ijson
+        added = {}
+        evaluations = {}
+        for event in self._read_log():
+            if event['op'] == 'add':
+                pred = Prediction.from_dict(event['prediction'])
+                added.setdefault(pred.id, pred)
+            elif event['op'] == 'evaluate':
+                evaluations[event['id']] = event
+
+        def patched(pred):
+            change = evaluations.get(pred.id)
+            if change:
+                pred.outcome = change['outcome']
+                pred.evaluated_date = change['evaluated_date']
+                pred.outcome_notes = change['outcome_notes']
+            return pred
+
+        with open(self.json_path, 'rb') as f:
+            for data in ijson.items(f, 'item', use_float=True):
+                pred = Prediction.from_dict(data)
+                # Already present if the log outlived a compaction
+                added.pop(pred.id, None)
+                pred = patched(pred)
+                if filter_fn is None or filter_fn(pred):
+                    yield pred
+        for pred in added.values():
+            pred = patched(pred)
+            if filter_fn is None or filter_fn(pred):
+                yield pred
+
+    def _apply(self, event: dict):
+        """Apply a single logged change to the in-memory predictions."""
+        if event['op'] == 'add':
+            pred = Prediction.from_dict(event['prediction'])
+            # Already present if the log outlived a compaction
+            if pred.id in self._by_id:
+                return
+            self.predictions.append(pred)
+            self._by_id[pred.id] = pred
+            if pred.outcome == 'pending':
+                self._pending[pred.id] = pred
+            self._year_counts[pred.id.split('-')[1]] += 1
+        elif event['op'] == 'evaluate':
+            pred = self._by_id.get(event['id'])
+            if pred:
+                if event['outcome'] == 'pending':
+                    self._pending[pred.id] = pred
+                else:
+                    self._pending.pop(pred.id, None)
+                pred.outcome = event['outcome']
+                pred.evaluated_date = event['evaluated_date']
+                pred.outcome_notes = event['outcome_notes']
+
+    def _record(self, *events: dict):
+        """Apply changes and persist them to the active backend in one write."""
+        if self._db is not None:
+            self._db_apply(*events)
+            return
+        # JSON backend: append to the change log rather than rewriting
+        for event in events:
+            if self.predictions is not None:
+                self._apply(event)
+            elif event['op'] == 'evaluate':
+                self._streamed.pop(event['id'], None)
+        self._dirty = True
+        with open(self.log_path, 'ab+') as f:
+            # A crash mid-append can leave a torn line with no newline; end it
+            # so the new entries aren't glued onto it and lost with it
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write(b"".join(_json_dumps(event) + b"\n" for event in events))
+            if self.durable:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _open_db(self):
+        """Open predictions.db as self._db and bring it up to date.
+
+        predictions.json is imported on first use, and any JSON change log
+        is applied and then removed, so an export can't drop its changes.
+        """
+        # Imported here so JSON-backend runs don't pay for it
+        import sqlite3
+        self._db = db = sqlite3.connect(self.db_path)
+        db.executescript(_SCHEMA)
+        (count,) = db.execute("SELECT COUNT(*) FROM predictions").fetchone()
+        if not count and self.json_path.exists():
+            predictions = self._load_predictions()
+            with db:
+                db.executemany(_INSERT_SQL, map(_prediction_to_row, predictions))
+            print(f"Imported {len(predictions)} predictions into {self.db_path}")
+        # The log holds JSON-backend changes the database hasn't seen, made
+        # before the import or since; apply them once and drop it
+        events = list(self._read_log())
+        if events:
+            self._db_apply(*events)
+            print(f"Applied {len(events)} logged changes to {self.db_path}")
+        if self.log_path.exists():
+            self.log_path.unlink()
+
+    def _db_apply(self, *events: dict):
+        """Apply changes to the SQLite store in a single transaction."""
+        with self._db:
+            for event in events:
+                if event['op'] == 'add':
+                    pred = Prediction.from_dict(event['prediction'])
+                    self._db.execute(_INSERT_SQL, _prediction_to_row(pred))
+                elif event['op'] == 'evaluate':
+                    self._db.execute(
+                        "UPDATE predictions SET outcome = ?, evaluated_date = ?, outcome_notes = ? "
+                        "WHERE id = ?",
+                        (event['outcome'], event['evaluated_date'], event['outcome_notes'], event['id'])
+                    )
+
+    def _db_select(self, where: str = "", params: tuple = ()) -> list:
+        """Fetch predictions from the SQLite store."""
+        sql = f"SELECT {', '.join(_FIELDS)}, extra FROM predictions {where}"
+        return [_row_to_prediction(row) for row in self._db.execute(sql, params)]
+
+    def _save_predictions(self, pretty: bool = False, force: bool = False):
+        """Save predictions to JSON and clear the change log.
+
+        The JSON backend skips the write when nothing has changed since
+        predictions.json was last written, unless force is set.
+        """
+        if self._db is not None:
+            predictions = self._db_select("ORDER BY id")
+        else:
+            self._ensure_loaded()
+            if not (self._dirty or force) and self.json_path.exists():
+                # A log with nothing applicable (e.g. only a torn line) has
+                # nothing to fold in, but still needs clearing
+                if self.log_path.exists():
+                    self.log_path.unlink()
+                print(f"{self.json_path} is up to date")
+                return
+            predictions = self.predictions
+        # Write beside the target and rename over it, so a crash mid-write
+        # leaves the previous predictions.json intact
+        tmp_path = self.json_path.with_suffix('.json.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(_json_dumps([p.to_dict() for p in predictions], pretty=pretty))
+            if self.durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.json_path)
+        if self.durable:
+            self._fsync_dir()
+        # Only drop the log once the JSON it folds into is in place. A SQLite
+        # export leaves it alone: the database took in the log when it was
+        # opened, so anything logged now is news to it
+        if self._db is None and self.log_path.exists():
+            self.log_path.unlink()
+        self._dirty = False
+        print(f"Saved {len(predictions)} predictions to {self.json_path}")
+
+    def _fsync_dir(self):
+        """Flush the public directory entry so a rename survives power loss."""
+        fd = os.open(self.public_dir, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def needs_compact(self) -> bool:
+        """Whether predictions.json is behind the backend's current state."""
+        if self._db is not None:
+            return (not self.json_path.exists()
+                    or self.db_path.stat().st_mtime > self.json_path.stat().st_mtime)
+        return self.log_path.exists()
+
+    def compact(self, pretty: bool = False):
+        """Write all predictions, including logged changes, to predictions.json.
+
+        Asking for pretty output always rewrites the file, since that changes
+        its layout even when no prediction changed.
+        """
+        self._save_predictions(pretty=pretty, force=pretty)
 
     def _generate_id(self) -> str:
         """Generate a unique prediction ID."""
         year = datetime.now().year
-        count = len([p for p in self.predictions if p['id'].startswith(f'PRED-{year}')]) + 1
+        if self._db is not None:
+            (used,) = self._db.execute(
+                "SELECT COUNT(*) FROM predictions WHERE id LIKE ?", (f"PRED-{year}-%",)
+            ).fetchone()
+        else:
+            self._ensure_loaded()
+            used = self._year_counts[str(year)]
+        count = used + 1
+        # Existing IDs are not always contiguous, so step past any taken ones
+        while self.get_prediction(f"PRED-{year}-{count:03d}") is not None:
+            count += 1
         return f"PRED-{year}-{count:03d}"
 
     def add_prediction(
@@ -73,8 +534,7 @@ class PredictionSync:
             "outcome_notes": None
         }
 
-        self.predictions.append(new_pred)
-        self._save_predictions()
+        self._record({"op": "add", "prediction": new_pred})
 
         print(f"\nAdded prediction: {pred_id}")
         print(f"  Domain: {domain}")
@@ -83,35 +543,104 @@ class PredictionSync:
 
         return pred_id
 
+    def get_prediction(self, pred_id: str):
+        """Look up a prediction by ID, or None if it does not exist."""
+        if self._db is not None:
+            rows = self._db_select("WHERE id = ?", (pred_id,))
+            return rows[0] if rows else None
+        if self._can_stream():
+            if pred_id not in self._streamed:
+                matches = self._load_predictions_streaming(lambda p: p.id == pred_id)
+                self._streamed[pred_id] = next(matches, None)
+                matches.close()
+            return self._streamed[pred_id]
+        self._ensure_loaded()
+        return self._by_id.get(pred_id)
+
     def evaluate_prediction(self, pred_id: str, outcome: str, notes: str = None):
         """Mark a prediction as correct or incorrect."""
-        for pred in self.predictions:
-            if pred['id'] == pred_id:
-                pred['outcome'] = outcome
-                pred['evaluated_date'] = datetime.now().strftime("%Y-%m-%d")
-                pred['outcome_notes'] = notes
-                self._save_predictions()
-
-                print(f"\nEvaluated {pred_id}: {outcome.upper()}")
-                if notes:
-                    print(f"  Notes: {notes}")
-                return True
-
-        print(f"Prediction {pred_id} not found")
-        return False
+        pred = self.get_prediction(pred_id)
+        if not pred:
+            print(f"Prediction {pred_id} not found")
+            return False
+        if pred.outcome == outcome and pred.outcome_notes == notes:
+            print(f"{pred_id} is already {outcome}; nothing to save")
+            return True
+
+        self._record({
+            "op": "evaluate",
+            "id": pred_id,
+            "outcome": outcome,
+            "evaluated_date": datetime.now().strftime("%Y-%m-%d"),
+            "outcome_notes": notes
+        })
+
+        print(f"\nEvaluated {pred_id}: {outcome.upper()}")
+        if notes:
+            print(f"  Notes: {notes}")
+        return True
+
+    def evaluate_many(self, updates) -> int:
+        """Evaluate several predictions, persisting them in a single write.
+
+        `updates` is an iterable of (pred_id, outcome, notes) tuples. Unknown
+        IDs and outcomes other than correct/incorrect are reported and
+        skipped. If an ID appears more than once the last entry wins, so each
+        prediction is recorded and counted once. Returns the number of
+        predictions evaluated.
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        # Queued events by ID; a repeat replaces the earlier entry in place
+        queued = {}
+        for pred_id, outcome, notes in updates:
+            if outcome not in ('correct', 'incorrect'):
+                print(f"Skipping {pred_id}: invalid outcome {outcome!r}")
+                continue
+            pred = self.get_prediction(pred_id)
+            if not pred:
+                print(f"Prediction {pred_id} not found")
+                continue
+            if pred.outcome == outcome and pred.outcome_notes == notes:
+                # Also cancels an earlier entry for this ID in the batch
+                queued.pop(pred_id, None)
+                print(f"{pred_id} is already {outcome}; nothing to save")
+                continue
+            queued[pred_id] = {
+                "op": "evaluate",
+                "id": pred_id,
+                "outcome": outcome,
+                "evaluated_date": today,
+                "outcome_notes": notes
+            }
+
+        events = list(queued.values())
+        if events:
+            self._record(*events)
+        for event in events:
+            print(f"Evaluated {event['id']}: {event['outcome'].upper()}")
+        return len(events)
 
     def list_pending(self):
         """List all pending predictions."""
-        pending = [p for p in self.predictions if p['outcome'] == 'pending']
-        pending.sort(key=lambda x: x['due_date'])
-
-        print(f"\n{'='*60}")
-        print(f"PENDING PREDICTIONS ({len(pending)})")
-        print('='*60)
-
+        if self._db is not None:
+            pending = self._db_select("WHERE outcome = 'pending' ORDER BY due_date")
+        else:
+            self._ensure_loaded()
+            # ISO dates sort chronologically as plain strings
+            pending = sorted(self._pending.values(), key=attrgetter('due_date'))
+
+        # Build the whole listing and write it once rather than per line
+        out = io.StringIO()
+        w = out.write
+        w(f"\n{'='*60}\n")
+        w(f"PENDING PREDICTIONS ({len(pending)})\n")
+        w('='*60 + "\n")
+
+        today = datetime.now().date()
         for p in pending:
-            due = datetime.strptime(p['due_date'], "%Y-%m-%d")
-            days_left = (due - datetime.now()).days
+            due_date = p.due_date
+            due = date.fromisoformat(due_date)
+            days_left = (due - today).days
 
             status = ""
             if days_left < 0:
@@ -121,64 +650,157 @@ class PredictionSync:
             elif days_left <= 2:
                 status = f" [DUE IN {days_left}d]"
 
-            print(f"\n{p['id']}{status}")
-            print(f"  {p['prediction'][:80]}...")
-            print(f"  Domain: {p['domain']} | Confidence: {p['confidence']}% | Due: {p['due_date']}")
+            w(f"\n{p.id}{status}\n"
+              f"  {p.prediction[:80]}...\n"
+              f"  Domain: {p.domain} | Confidence: {p.confidence}% | Due: {due_date}\n")
+
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+
+    def _tally(self) -> tuple:
+        """Count outcomes and sum Brier terms over evaluated predictions.
+
+        Returns (total, evaluated, correct, incorrect, pending, brier_sum).
+        """
+        total = evaluated = correct = incorrect = pending = 0
+        brier_sum = 0.0
+
+        if self._db is not None:
+            # Let SQLite aggregate; (outcome = 'correct') evaluates to 1 or 0
+            rows = self._db.execute(
+                "SELECT outcome, COUNT(*), "
+                "SUM((confidence / 100.0 - (outcome = 'correct')) "
+                "  * (confidence / 100.0 - (outcome = 'correct'))) "
+                "FROM predictions GROUP BY outcome"
+            )
+            for outcome, count, group_brier in rows:
+                total += count
+                if outcome == 'pending':
+                    pending = count
+                    continue
+                evaluated += count
+                brier_sum += group_brier or 0.0
+                if outcome == 'correct':
+                    correct = count
+                elif outcome == 'incorrect':
+                    incorrect = count
+            return total, evaluated, correct, incorrect, pending, brier_sum
+
+        if self._can_stream():
+            # Count as records stream past; the full list is never built
+            return _tally_items(self._load_predictions_streaming())
+
+        self._ensure_loaded()
+        return _tally_items(self.predictions)
 
     def show_stats(self):
         """Show prediction statistics."""
-        total = len(self.predictions)
-        evaluated = [p for p in self.predictions if p['outcome'] != 'pending']
-        correct = [p for p in self.predictions if p['outcome'] == 'correct']
-        incorrect = [p for p in self.predictions if p['outcome'] == 'incorrect']
-        pending = [p for p in self.predictions if p['outcome'] == 'pending']
-
-        accuracy = (len(correct) / len(evaluated) * 100) if evaluated else 0
-
-        # Brier score
-        brier = 0
-        if evaluated:
-            for p in evaluated:
-                outcome_val = 1 if p['outcome'] == 'correct' else 0
-                conf = p['confidence'] / 100
-                brier += (conf - outcome_val) ** 2
-            brier = brier / len(evaluated)
-
-        print(f"\n{'='*60}")
-        print("PREDICTION STATISTICS")
-        print('='*60)
-        print(f"  Total predictions:  {total}")
-        print(f"  Evaluated:          {len(evaluated)}")
-        print(f"  Correct:            {len(correct)}")
-        print(f"  Incorrect:          {len(incorrect)}")
-        print(f"  Pending:            {len(pending)}")
-        print(f"  Accuracy:           {accuracy:.1f}%")
-        print(f"  Brier Score:        {brier:.3f}")
-        print('='*60)
+        total, evaluated, correct, incorrect, pending, brier_sum = self._tally()
+
+        accuracy = (correct / evaluated * 100) if evaluated else 0
+        brier = brier_sum / evaluated if evaluated else 0
+
+        sys.stdout.write(
+            f"\n{'='*60}\n"
+            "PREDICTION STATISTICS\n"
+            f"{'='*60}\n"
+            f"  Total predictions:  {total}\n"
+            f"  Evaluated:          {evaluated}\n"
+            f"  Correct:            {correct}\n"
+            f"  Incorrect:          {incorrect}\n"
+            f"  Pending:            {pending}\n"
+            f"  Accuracy:           {accuracy:.1f}%\n"
+            f"  Brier Score:        {brier:.3f}\n"
+            f"{'='*60}\n"
+        )
+        sys.stdout.flush()
+
+
+# Domains offered by interactive_add; the last two appear in existing data
+_DOMAIN_NAMES = ('Diplomacy', 'Security', 'Economic', 'Political', 'Canada', 'Social', 'Technology')
+_DOMAINS = frozenset(_DOMAIN_NAMES)
+
+
+def _answer_reader(interactive: bool):
+    """Return a prompt function for interactive_add.
+
+    On a terminal this is just input(). When stdin is piped (e.g.
+    ``--add < pred.txt``) all answers are read in one go, one per line in
+    prompt order, and handed out without echoing the prompts.
+    """
+    if interactive:
+        return input
+    answers = iter(sys.stdin.read().splitlines())
+    return lambda prompt="": next(answers, "")
+
+
+def _ask_valid(ask, prompt: str, parse, retry: bool):
+    """Ask until parse() accepts the answer; without retry, give up with None."""
+    while True:
+        try:
+            return parse(ask(prompt).strip())
+        except ValueError as e:
+            print(f"Invalid input: {e}")
+            if not retry:
+                return None
+
+
+def _int_between(low: int, high: int):
+    """Build a parser accepting whole numbers in [low, high]."""
+    def parse(raw: str) -> int:
+        try:
+            value = int(raw)
+        except ValueError:
+            value = None
+        if value is None or not low <= value <= high:
+            raise ValueError(f"enter a whole number from {low} to {high}")
+        return value
+    return parse
+
+
+def _domain(raw: str) -> str:
+    """Parse a domain name, accepting any capitalization."""
+    domain = raw.capitalize()
+    if domain not in _DOMAINS:
+        raise ValueError(f"domain must be one of {'/'.join(_DOMAIN_NAMES)}")
+    return domain
 
 
 def interactive_add(sync: PredictionSync):
     """Interactive mode to add a prediction."""
+    # Re-prompt on a terminal; piped answers can't be re-asked, so bail out
+    interactive = sys.stdin.isatty()
+    ask = _answer_reader(interactive)
+
     print("\n" + "="*60)
     print("ADD NEW PREDICTION")
     print("="*60)
 
-    prediction = input("\nPrediction statement:\n> ").strip()
+    prediction = ask("\nPrediction statement:\n> ").strip()
     if not prediction:
         print("Cancelled.")
         return
 
-    domain = input("\nDomain (Diplomacy/Security/Economic/Political/Canada):\n> ").strip()
+    domain = _ask_valid(ask, f"\nDomain ({'/'.join(_DOMAIN_NAMES)}):\n> ", _domain, interactive)
+    if domain is None:
+        print("Cancelled.")
+        return
 
-    confidence = int(input("\nConfidence (50-95):\n> ").strip())
+    confidence = _ask_valid(ask, "\nConfidence (50-95):\n> ", _int_between(50, 95), interactive)
+    if confidence is None:
+        print("Cancelled.")
+        return
 
-    due_days = int(input("\nDays until due (e.g., 5):\n> ").strip())
+    due_days = _ask_valid(ask, "\nDays until due (e.g., 5):\n> ", _int_between(1, 3650), interactive)
+    if due_days is None:
+        print("Cancelled.")
+        return
 
-    verification = input("\nVerification criteria (how to prove correct):\n> ").strip()
+    verification = ask("\nVerification criteria (how to prove correct):\n> ").strip()
 
-    falsification = input("\nFalsification criteria (how to prove incorrect):\n> ").strip()
+    falsification = ask("\nFalsification criteria (how to prove incorrect):\n> ").strip()
 
-    sources_raw = input("\nSources (comma-separated, or blank):\n> ").strip()
+    sources_raw = ask("\nSources (comma-separated, or blank):\n> ").strip()
     sources = [s.strip() for s in sources_raw.split(",")] if sources_raw else []
 
     print("\n" + "-"*60)
@@ -189,7 +811,7 @@ def interactive_add(sync: PredictionSync):
     print(f"  Due in: {due_days} days")
     print("-"*60)
 
-    confirm = input("\nConfirm? (y/n): ").strip().lower()
+    confirm = ask("\nConfirm? (y/n): ").strip().lower()
     if confirm == 'y':
         sync.add_prediction(
             prediction=prediction,
@@ -206,8 +828,7 @@ def interactive_add(sync: PredictionSync):
 
 def interactive_evaluate(sync: PredictionSync, pred_id: str):
     """Interactive mode to evaluate a prediction."""
-    # Find prediction
-    pred = next((p for p in sync.predictions if p['id'] == pred_id), None)
+    pred = sync.get_prediction(pred_id)
     if not pred:
         print(f"Prediction {pred_id} not found.")
         return
@@ -215,11 +836,11 @@ def interactive_evaluate(sync: PredictionSync, pred_id: str):
     print("\n" + "="*60)
     print(f"EVALUATE: {pred_id}")
     print("="*60)
-    print(f"\n{pred['prediction']}")
-    print(f"\nDomain: {pred['domain']} | Confidence: {pred['confidence']}%")
-    print(f"Due: {pred['due_date']}")
-    print(f"\nVerification: {pred['verification']}")
-    print(f"Falsification: {pred['falsification']}")
+    print(f"\n{pred.prediction}")
+    print(f"\nDomain: {pred.domain} | Confidence: {pred.confidence}%")
+    print(f"Due: {pred.due_date}")
+    print(f"\nVerification: {pred.verification}")
+    print(f"Falsification: {pred.falsification}")
 
     outcome = input("\nOutcome (correct/incorrect): ").strip().lower()
     if outcome not in ['correct', 'incorrect']:
@@ -231,29 +852,71 @@ def interactive_evaluate(sync: PredictionSync, pred_id: str):
     sync.evaluate_prediction(pred_id, outcome, notes)
 
 
+def batch_evaluate(sync: PredictionSync, path: str):
+    """Apply a JSON-Lines file of {"id", "outcome", "notes"} updates at once."""
+    updates = []
+    with open(path, 'rb') as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = _json_loads(line)
+                updates.append((item['id'], item['outcome'], item.get('notes')))
+            except (ValueError, KeyError, TypeError):
+                print(f"Skipping unreadable line {lineno} in {path}")
+    count = sync.evaluate_many(updates)
+    print(f"\nEvaluated {count} of {len(updates)} predictions")
+
+
+def sync_and_report(sync: PredictionSync, pretty: bool = False):
+    """Default run: publish any pending changes, then show stats and pending."""
+    if sync.needs_compact():
+        sync.compact(pretty=pretty)
+    sync.show_stats()
+    sync.list_pending()
+
+
 def main():
+    if len(sys.argv) == 1:
+        # Bare invocation from cron: skip building the argument parser
+        sync_and_report(PredictionSync())
+        return
+
+    import argparse
     parser = argparse.ArgumentParser(description="Prediction Tracker Sync")
     parser.add_argument("--add", action="store_true", help="Add new prediction")
     parser.add_argument("--evaluate", type=str, help="Evaluate prediction by ID")
+    parser.add_argument("--evaluate-batch", metavar="FILE",
+                        help="Evaluate predictions from a JSONL file of id/outcome/notes")
     parser.add_argument("--pending", action="store_true", help="List pending predictions")
     parser.add_argument("--stats", action="store_true", help="Show statistics")
+    parser.add_argument("--compact", action="store_true", help="Fold the change log into predictions.json")
+    parser.add_argument("--pretty", action="store_true", help="Indent predictions.json when writing it")
+    parser.add_argument("--durable", action="store_true",
+                        help="fsync JSON and change-log writes before returning")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json",
+                        help="Store predictions in predictions.json (default) or predictions.db")
 
     args = parser.parse_args()
 
-    sync = PredictionSync()
+    # Only a single lookup or the statistics are needed on these paths
+    stream = bool(args.evaluate or args.stats)
+    sync = PredictionSync(backend=args.backend, durable=args.durable, stream=stream)
 
     if args.add:
         interactive_add(sync)
     elif args.evaluate:
         interactive_evaluate(sync, args.evaluate)
+    elif args.evaluate_batch:
+        batch_evaluate(sync, args.evaluate_batch)
     elif args.pending:
         sync.list_pending()
     elif args.stats:
         sync.show_stats()
+    elif args.compact:
+        sync.compact(pretty=args.pretty)
     else:
-        # Default: show stats and pending
-        sync.show_stats()
-        sync.list_pending()
+        sync_and_report(sync, pretty=args.pretty)
 
 
 if __name__ == "__main__":